@@ -1,10 +1,17 @@
 import math
 import argparse
 import ezdxf
-import matplotlib.pyplot as plt
 from scipy.spatial import cKDTree
 import numpy as np
-from collections import defaultdict
+from functools import lru_cache
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
 
 # ===================
 # CONFIGURATION BLOCK
@@ -12,7 +19,6 @@ from collections import defaultdict
 DEFAULT_UNIT = "mm"
 DEFAULT_PRECISION_UM = 0.1
 DEFAULT_ARC_SEGMENTS = 100
-GAP_TOLERANCE = 1e-6
 OUTPUT_SCALE = 1.0  # e.g., 0.5 for 2:1 scaling
 FLIP_Y = False      # Set to True to flip vertically
 
@@ -24,130 +30,338 @@ UNIT_CONVERSION = {
 # ============
 # GEOMETRY UTILS
 # ============
-def distance(p1, p2):
-    return math.hypot(p1[0] - p2[0], p1[1] - p2[1])
-
-def transform_point(pt, scale, flip_y):
-    x, y = pt
-    x *= scale
-    y *= -scale if flip_y else scale
-    return (x, y)
+def transform_points(points, scale, flip_y):
+    return points * np.array([scale, -scale if flip_y else scale])
 
-def flatten_arc(center, radius, start_angle, end_angle, segments):
+@lru_cache(maxsize=4096)
+def arc_template(start_angle, end_angle, segments):
+    # Unit-radius arc segments around the origin. Cached because drawings
+    # tend to repeat the same arcs and circles many times; the result is
+    # shared, so it is made read-only.
     start_rad = math.radians(start_angle)
     end_rad = math.radians(end_angle)
     if end_rad < start_rad:
         end_rad += 2 * math.pi
-    step = (end_rad - start_rad) / segments
-    points = [(center[0] + radius * math.cos(start_rad + i * step),
-               center[1] + radius * math.sin(start_rad + i * step))
-              for i in range(segments + 1)]
-    return [(points[i], points[i + 1]) for i in range(len(points) - 1)]
+    angles = np.linspace(start_rad, end_rad, segments + 1)
+    points = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+    template = np.stack([points[:-1], points[1:]], axis=1)
+    template.setflags(write=False)
+    return template
+
+def flatten_arc(center, radius, start_angle, end_angle, segments):
+    return np.asarray(center) + radius * arc_template(start_angle, end_angle, segments)
 
 def flatten_polyline(points, is_closed):
-    segments = [(points[i], points[i + 1]) for i in range(len(points) - 1)]
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
     if is_closed and len(points) > 2:
-        segments.append((points[-1], points[0]))
-    return segments
+        points = np.concatenate([points, points[:1]])
+    return np.stack([points[:-1], points[1:]], axis=1)
+
+def find_root(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def cluster_roots(n, pairs):
+    # Union-find over neighbour pairs; the lowest index of each cluster is
+    # kept as its root so the representative point is deterministic.
+    parent = np.arange(n, dtype=np.int32)
+    for i, j in pairs.tolist():
+        ri, rj = find_root(parent, i), find_root(parent, j)
+        if ri != rj:
+            if ri < rj:
+                parent[rj] = ri
+            else:
+                parent[ri] = rj
+    while True:
+        grandparent = parent[parent]
+        if np.array_equal(grandparent, parent):
+            return parent
+        parent = grandparent
+
+def grid_unique(points, spacing, chunk=1 << 20):
+    # Exact duplicates and points sharing a grid cell collapse to one id.
+    # Returns the index of each cell's first point and the cell id per point.
+    # Keys are computed in float64 a chunk at a time, so float32 input never
+    # needs a full-size float64 copy.
+    def cell_coords(block):
+        return np.rint(np.divide(block, spacing, dtype=np.float64)).astype(np.int64)
+
+    low = cell_coords(points.min(axis=0))
+    span = cell_coords(points.max(axis=0)) - low + 1
+    # Pack both cell coordinates into one int64 when they fit, so the
+    # argsort below compares int64 values instead of 16-byte void records.
+    packed = int(span[0]) * int(span[1]) < 2 ** 63
+    keys = np.empty(len(points) if packed else (len(points), 2), dtype=np.int64)
+    for start in range(0, len(points), chunk):
+        cells = cell_coords(points[start:start + chunk]) - low
+        keys[start:start + chunk] = cells[:, 0] * span[1] + cells[:, 1] if packed else cells
+    if not packed:
+        keys = keys.view("V16").ravel()
+    # Equivalent to np.unique(keys, return_index=True, return_inverse=True)
+    # but without its int64 temporaries, which dominate peak memory here.
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    new_cell = np.empty(len(keys), dtype=bool)
+    new_cell[:1] = True
+    new_cell[1:] = keys[1:] != keys[:-1]
+    del keys
+    inverse = np.empty(len(order), dtype=np.int32)
+    inverse[order] = np.cumsum(new_cell, dtype=np.int32) - 1
+    return order[new_cell], inverse
+
+def exact_unique(points):
+    # Collapses bit-identical points only. Returns the index of each distinct
+    # point's first occurrence and the distinct-point id per point.
+    records = np.ascontiguousarray(points).view(np.dtype((np.void, 2 * points.itemsize)))
+    _, first, inverse = np.unique(records.ravel(), return_index=True, return_inverse=True)
+    return first, inverse.ravel().astype(np.int32)
 
 def snap_points_kdtree(points, tolerance):
-    if not points:
-        return {}
-    points_array = np.array(list(points))
-    tree = cKDTree(points_array)
-    groups = tree.query_ball_tree(tree, tolerance)
-
-    clustered = {}
-    visited = set()
-    for group in groups:
-        cluster_indices = tuple(sorted(group))
-        if not any(i in visited for i in cluster_indices):
-            center = tuple(points_array[cluster_indices[0]])
-            for idx in cluster_indices:
-                clustered[tuple(points_array[idx])] = center
-            visited.update(cluster_indices)
-    return clustered
+    # Returns a table of snapped points and, for every input point, the id
+    # of the table row it was snapped to.
+    if len(points) == 0:
+        return points, np.empty(0, dtype=np.int32)
+    if tolerance <= 0:
+        first, inverse = exact_unique(points)
+        return points[first], inverse
+    # A cell of tolerance / 2 has a diagonal below the tolerance, so merging
+    # within a cell never joins points the KD-tree would keep apart. Cell
+    # coordinates beyond 2**61 could overflow int64 (or their span could),
+    # so such drawings skip the grid and give the tree every distinct point.
+    spacing = tolerance / 2
+    if np.abs(points).max() / spacing < 2 ** 61:
+        first, inverse = grid_unique(points, spacing)
+    else:
+        first, inverse = exact_unique(points)
+    cells = points[first]
+    # Any member of a cell can pair with a member of a neighbouring cell, so
+    # the tree needs every distinct point, not just one per cell. Most points
+    # are exact copies of their cell's first point; only the rest are added.
+    extra = np.flatnonzero((points != cells[inverse]).any(axis=1))
+    if len(extra):
+        extra = extra[exact_unique(points[extra])[0]]
+    tree_points = np.concatenate([cells, points[extra]])
+    tree_cells = np.concatenate([np.arange(len(cells), dtype=np.int32), inverse[extra]])
+    # The tree is queried once, so build time matters as much as query time:
+    # sliding-midpoint splits with small leaves were fastest on DXF point sets.
+    tree = cKDTree(tree_points, leafsize=16, compact_nodes=True, balanced_tree=False)
+    pairs = tree_cells[tree.query_pairs(tolerance, output_type="ndarray")]
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    if len(pairs) == 0:
+        return cells, inverse
+    roots = cluster_roots(len(cells), pairs)
+    return cells, roots[inverse]
 
 # ============
 # VISUALIZATION
 # ============
 def plot_overlay(closed_paths, open_paths, snapping_events):
-    plt.figure(figsize=(10, 10), dpi=300)
-    for path in closed_paths:
-        xs, ys = zip(*path)
-        plt.plot(xs, ys, 'k-', linewidth=0.3)
-    for path in open_paths:
-        xs, ys = zip(*path)
-        plt.plot(xs, ys, 'orange', linewidth=0.5, alpha=0.6)
+    # Imported here so runs without --plot never load matplotlib. A bare
+    # Figure renders through Agg on savefig without touching pyplot or the
+    # global backend of a caller using this module as a library.
+    from matplotlib.collections import LineCollection
+    from matplotlib.figure import Figure
 
-    for pt in snapping_events:
-        plt.plot(pt[0], pt[1], 'go', markersize=1.5, label='Snapping Point' if pt == snapping_events[0] else "")
+    fig = Figure(figsize=(10, 10), dpi=300)
+    ax = fig.subplots()
+    ax.add_collection(LineCollection(closed_paths, colors='k', linewidths=0.3))
+    ax.add_collection(LineCollection(open_paths, colors='orange', linewidths=0.5, alpha=0.6))
 
-    for path in open_paths:
-        if len(path) > 1:
-            plt.plot(path[0][0], path[0][1], 'ro', markersize=2, label='Open Path Start' if path == open_paths[0] else "")
-            plt.plot(path[-1][0], path[-1][1], 'mo', markersize=2, label='Open Path End' if path == open_paths[0] else "")
-
-    plt.title("Closed (black), Open (orange), Snap (green), Gaps (red/magenta)")
-    handles, labels = plt.gca().get_legend_handles_labels()
-    by_label = dict(zip(labels, handles))
-    plt.legend(by_label.values(), by_label.keys(), fontsize='x-small')
-    plt.axis('equal')
-    plt.grid(True, linestyle='--', linewidth=0.3)
-    plt.savefig("reconstruction_overlay.png", bbox_inches='tight')
+    if len(snapping_events):
+        ax.scatter(snapping_events[:, 0], snapping_events[:, 1], s=2.25, c='g', label='Snapping Point')
+
+    gap_paths = [path for path in open_paths if len(path) > 1]
+    if gap_paths:
+        starts = np.array([path[0] for path in gap_paths])
+        ends = np.array([path[-1] for path in gap_paths])
+        ax.scatter(starts[:, 0], starts[:, 1], s=4, c='r', label='Open Path Start')
+        ax.scatter(ends[:, 0], ends[:, 1], s=4, c='m', label='Open Path End')
+
+    ax.set_title("Closed (black), Open (orange), Snap (green), Gaps (red/magenta)")
+    if ax.get_legend_handles_labels()[0]:
+        ax.legend(fontsize='x-small')
+    ax.autoscale_view()
+    ax.axis('equal')
+    ax.grid(True, linestyle='--', linewidth=0.3)
+    fig.savefig("reconstruction_overlay.png", bbox_inches='tight')
     print("Saved path reconstruction visualization as: reconstruction_overlay.png")
-    plt.close()
 
 # ============
 # PATH WALKING
 # ============
-def pathwalk_reconstruct(segments, tolerance=GAP_TOLERANCE):
-    edge_map = defaultdict(list)
-    for a, b in segments:
-        edge_map[a].append(b)
-        edge_map[b].append(a)
+def build_csr_adjacency(edges, n):
+    # Directed edge 2*i is a->b of segment i and 2*i+1 is b->a, so the
+    # reverse of any directed edge d is d ^ 1 before reordering into rows.
+    src = edges.ravel()
+    dst = edges[:, ::-1].ravel()
+    degree = np.bincount(src, minlength=n)
+    row_ptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(degree, out=row_ptr[1:])
+    order = np.argsort(src, kind="stable")
+    neighbors = dst[order].astype(np.int32)
+    slot = np.empty(len(order), dtype=np.int32)
+    slot[order] = np.arange(len(order), dtype=np.int32)
+    rev_slot = np.empty_like(slot)
+    rev_slot[slot] = slot[np.arange(len(slot)) ^ 1]
+    return row_ptr, neighbors, rev_slot
+
+@njit(cache=True)
+def walk_from(start, row_ptr, neighbors, rev_slot, used, remaining, cursor, flat, pos):
+    # Follows unused edges from start until stuck or back at start. Returns
+    # the new end of flat and whether the path closed. Slots before
+    # cursor[v] are known to be used, so each row is scanned only once.
+    path_start = pos
+    flat[pos] = start
+    pos += 1
+    current = start
+    while remaining[current] > 0:
+        k = cursor[current]
+        while used[k]:
+            k += 1
+        cursor[current] = k + 1
+        used[k] = 1
+        used[rev_slot[k]] = 1
+        next_id = neighbors[k]
+        remaining[current] -= 1
+        remaining[next_id] -= 1
+        flat[pos] = next_id
+        pos += 1
+        current = next_id
+        if next_id == start and pos - path_start > 2:
+            return pos, True
+    return pos, False
+
+@njit(cache=True)
+def walk_all(row_ptr, neighbors, rev_slot, n):
+    # Paths are returned CSR-style: path i is flat[offsets[i]:offsets[i + 1]].
+    # Open chains can only end at odd-degree vertices, so walks start there
+    # first and cover each chain in one piece; a second sweep picks up the
+    # remaining closed loops. Every walk uses at least one edge, so there are
+    # at most m paths and m + m vertices in total.
+    m = len(neighbors) // 2
+    used = np.zeros(len(neighbors), np.uint8)
+    flat = np.empty(2 * m, np.int32)
+    offsets = np.zeros(m + 1, np.int32)
+    is_closed = np.zeros(m, np.uint8)
+    remaining = row_ptr[1:] - row_ptr[:-1]
+    cursor = row_ptr[:-1].copy()
+    n_paths = 0
+    pos = 0
+    for odd_pass in (True, False):
+        for v in range(n):
+            if odd_pass and remaining[v] % 2 == 0:
+                continue
+            while remaining[v] > 0:
+                pos, closed = walk_from(v, row_ptr, neighbors, rev_slot, used, remaining, cursor, flat, pos)
+                is_closed[n_paths] = closed
+                n_paths += 1
+                offsets[n_paths] = pos
+    return offsets[:n_paths + 1], flat[:pos], is_closed[:n_paths]
 
-    used_edges = set()
+def pathwalk_reconstruct(segments, points_xy):
+    # Segments is an (M, 2) array of ids into points_xy. Endpoints are already
+    # snapped, so distinct ids are farther apart than the snapping tolerance
+    # and closure reduces to an id comparison.
+    vertex_ids, edges = np.unique(segments, return_inverse=True)
+    edges = edges.reshape(-1, 2).astype(np.int32)
+    n = len(vertex_ids)
+    row_ptr, neighbors, rev_slot = build_csr_adjacency(edges, n)
+
+    offsets, flat, is_closed = walk_all(row_ptr, neighbors, rev_slot, n)
+    paths = np.split(points_xy[vertex_ids[flat]], offsets[1:-1])
     polygons = []
     open_paths = []
-
-    def walk_path(start):
-        path = [start]
-        current = start
-        while True:
-            neighbors = edge_map[current]
-            next_pt = None
-            for pt in neighbors:
-                edge = tuple(sorted((current, pt)))
-                if edge not in used_edges:
-                    used_edges.add(edge)
-                    next_pt = pt
-                    break
-            if not next_pt:
-                return path
-            path.append(next_pt)
-            current = next_pt
-            if len(path) > 2 and distance(path[0], path[-1]) < tolerance:
-                path[-1] = path[0]
-                return path
-
-    visited_pts = set()
-    for pt in edge_map:
-        if pt not in visited_pts:
-            path = walk_path(pt)
-            visited_pts.update(path)
-            if len(path) > 2 and distance(path[0], path[-1]) < tolerance:
-                polygons.append(path)
-            else:
-                open_paths.append(path)
+    for coords, closed in zip(paths, is_closed.tolist()):
+        if closed:
+            polygons.append(coords)
+        else:
+            open_paths.append(coords)
 
     return polygons, open_paths
 
+# ==================
+# ENTITY EXTRACTION
+# ==================
+class SegmentBuffer:
+    # Growable (n, 2, 2) segment array; capacity doubles on overflow so
+    # appends are amortized O(1) without any per-segment Python objects.
+    # A float32 buffer stores blocks only while every coordinate stays within
+    # max_coord; past that it switches to float64 for the rest of the file.
+    # Values already stored were within the bound, so their rounding error
+    # is still acceptable.
+    def __init__(self, capacity, dtype=np.float64, max_coord=np.inf):
+        self.data = np.empty((max(capacity, 1), 2, 2), dtype=dtype)
+        self.size = 0
+        self.max_coord = max_coord
+
+    def reserve(self, count):
+        end = self.size + count
+        if end > len(self.data):
+            grown = np.empty((max(end, 2 * len(self.data)), 2, 2), dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        return end
+
+    def check_bounds(self, coord_max):
+        if coord_max > self.max_coord:
+            self.data = self.data.astype(np.float64)
+            self.max_coord = np.inf
+
+    def append(self, block):
+        if self.max_coord < np.inf and len(block):
+            self.check_bounds(np.abs(block).max())
+        end = self.reserve(len(block))
+        self.data[self.size:end] = block
+        self.size = end
+
+    def append_line(self, x0, y0, x1, y1):
+        if self.max_coord < np.inf:
+            self.check_bounds(max(abs(x0), abs(y0), abs(x1), abs(y1)))
+        end = self.reserve(1)
+        self.data[self.size] = ((x0, y0), (x1, y1))
+        self.size = end
+
+    def array(self):
+        return self.data[:self.size]
+
+def handle_line(e, segments):
+    dxf = e.dxf
+    start, end = dxf.start, dxf.end
+    segments.append_line(start.x, start.y, end.x, end.y)
+
+def handle_arc(e, segments):
+    dxf = e.dxf
+    center = dxf.center
+    segments.append(flatten_arc((center.x, center.y), dxf.radius,
+                                dxf.start_angle, dxf.end_angle, DEFAULT_ARC_SEGMENTS))
+
+def handle_circle(e, segments):
+    dxf = e.dxf
+    center = dxf.center
+    segments.append(flatten_arc((center.x, center.y), dxf.radius, 0, 360, DEFAULT_ARC_SEGMENTS))
+
+def handle_polyline(e, segments):
+    pts = [(loc.x, loc.y) for loc in (v.dxf.location for v in e.vertices)]
+    segments.append(flatten_polyline(pts, e.is_closed))
+
+def handle_lwpolyline(e, segments):
+    segments.append(flatten_polyline(e.get_points("xy"), e.is_closed))
+
+ENTITY_HANDLERS = {
+    "LINE": handle_line,
+    "ARC": handle_arc,
+    "CIRCLE": handle_circle,
+    "POLYLINE": handle_polyline,
+    "LWPOLYLINE": handle_lwpolyline,
+}
+
 # ============
 # MAIN PROCESS
 # ============
 def process_dxf(input_file, output_file, unit=DEFAULT_UNIT, precision_um=DEFAULT_PRECISION_UM,
-                scale=OUTPUT_SCALE, flip_y=FLIP_Y):
+                scale=OUTPUT_SCALE, flip_y=FLIP_Y, plot=False, dtype="float64"):
     print(f"Loading DXF file: {input_file}")
     doc = ezdxf.readfile(input_file)
     msp = doc.modelspace()
@@ -156,35 +370,37 @@ def process_dxf(input_file, output_file, unit=DEFAULT_UNIT, precision_um=DEFAULT
     print(f"Snapping tolerance set to {tolerance} {unit} ({precision_um} µm)")
     print(f"Output scale: {scale} | Flip Y: {'Yes' if flip_y else 'No'}")
 
-    lines, all_points = [], set()
+    # One segment per entity is a cheap lower bound; arcs grow the buffer.
+    if dtype == "float32":
+        # float32 rounding error grows with coordinate magnitude; only use it
+        # while that error stays well below the snapping tolerance.
+        segments = SegmentBuffer(len(msp), np.float32, tolerance / 10 / np.finfo(np.float32).eps)
+    else:
+        segments = SegmentBuffer(len(msp))
     for e in msp:
-        if e.dxftype() == "LINE":
-            s, e = (e.dxf.start.x, e.dxf.start.y), (e.dxf.end.x, e.dxf.end.y)
-            lines.append((s, e))
-            all_points.update([s, e])
-        elif e.dxftype() == "ARC":
-            segments = flatten_arc((e.dxf.center.x, e.dxf.center.y), e.dxf.radius,
-                                   e.dxf.start_angle, e.dxf.end_angle, DEFAULT_ARC_SEGMENTS)
-            lines.extend(segments)
-            for seg in segments: all_points.update(seg)
-        elif e.dxftype() == "CIRCLE":
-            segments = flatten_arc((e.dxf.center.x, e.dxf.center.y), e.dxf.radius, 0, 360, DEFAULT_ARC_SEGMENTS)
-            lines.extend(segments)
-            for seg in segments: all_points.update(seg)
-        elif e.dxftype() in ["POLYLINE", "LWPOLYLINE"]:
-            pts = [(v.dxf.location.x, v.dxf.location.y) for v in e.vertices] if e.dxftype() == "POLYLINE" else [tuple(p) for p in e.get_points("xy")]
-            segments = flatten_polyline(pts, e.is_closed)
-            lines.extend(segments)
-            for seg in segments: all_points.update(seg)
-
-    snapped_map = snap_points_kdtree(all_points, tolerance)
-    snapping_events = [pt for pt in all_points if distance(pt, snapped_map.get(pt, pt)) > 1e-9]
+        handler = ENTITY_HANDLERS.get(e.dxftype())
+        if handler is not None:
+            handler(e, segments)
+
+    # Segment i is segments_xy[i] = [[x0, y0], [x1, y1]]
+    segments_xy = segments.array()
+    all_points = segments_xy.reshape(-1, 2)
+    if dtype == "float32" and all_points.dtype != np.float32:
+        print("float32 is too coarse for this drawing at the requested precision; using float64")
+    points_xy, point_ids = snap_points_kdtree(all_points, tolerance)
+    offsets = all_points - points_xy[point_ids]
+    moved = np.einsum("ij,ij->i", offsets, offsets) > 1e-18
+    snapping_events = np.unique(all_points[moved], axis=0)
     print(f"Snapping events: {len(snapping_events)}")
 
-    updated_lines = [(snapped_map.get(s, s), snapped_map.get(e, e)) for s, e in lines]
-    unique_segments = set(tuple(sorted([s, e])) for s, e in updated_lines)
+    # Sort each id pair so (A, B) == (B, A), drop segments collapsed to a
+    # single point by snapping, then deduplicate.
+    segment_ids = point_ids.reshape(-1, 2)
+    segment_ids.sort(axis=1)
+    segment_ids = segment_ids[segment_ids[:, 0] != segment_ids[:, 1]]
+    unique_segments = np.unique(segment_ids, axis=0)
 
-    closed_shapes, open_paths = pathwalk_reconstruct(unique_segments)
+    closed_shapes, open_paths = pathwalk_reconstruct(unique_segments, points_xy)
     print(f"Closed shapes reconstructed: {len(closed_shapes)}")
     print(f"Open paths (not closed):      {len(open_paths)}")
 
@@ -192,19 +408,23 @@ def process_dxf(input_file, output_file, unit=DEFAULT_UNIT, precision_um=DEFAULT
     new_doc = ezdxf.new()
     new_msp = new_doc.modelspace()
     for path in closed_shapes:
-        new_msp.add_lwpolyline([transform_point(p, scale, flip_y) for p in path], close=True)
+        new_msp.add_lwpolyline(transform_points(path, scale, flip_y), close=True)
     for path in open_paths:
-        for i in range(len(path) - 1):
-            new_msp.add_line(transform_point(path[i], scale, flip_y), transform_point(path[i + 1], scale, flip_y))
+        new_msp.add_lwpolyline(transform_points(path, scale, flip_y), close=False)
     new_doc.saveas(output_file)
     print(f"Saved cleaned DXF to: {output_file}")
 
     # Visualization
-    plot_overlay(closed_shapes, open_paths, snapping_events)
+    if plot:
+        plot_overlay(closed_shapes, open_paths, snapping_events)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="DXF reconstruction with scaling and flipping options.")
     parser.add_argument("input", help="Input DXF file path")
     parser.add_argument("output", help="Output DXF file path")
+    parser.add_argument("--plot", action="store_true",
+                        help="Save a reconstruction_overlay.png diagnostic image")
+    parser.add_argument("--dtype", choices=["float32", "float64"], default="float64",
+                        help="Coordinate precision for snapping (float32 is used only when safe)")
     args = parser.parse_args()
-    process_dxf(args.input, args.output)
+    process_dxf(args.input, args.output, plot=args.plot, dtype=args.dtype)
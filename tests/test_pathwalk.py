@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fix_dxf import pathwalk_reconstruct
+
+
+def walk(edges):
+    # Point i sits at (i, 0), so output coordinates map straight back to ids.
+    edges = np.array(edges, dtype=np.int32).reshape(-1, 2)
+    n = int(edges.max()) + 1 if len(edges) else 0
+    points = np.column_stack([np.arange(n), np.zeros(n)]).astype(np.float64)
+    closed, open_paths = pathwalk_reconstruct(edges, points)
+    to_ids = lambda paths: [path[:, 0].astype(int).tolist() for path in paths]
+    return to_ids(closed), to_ids(open_paths)
+
+
+def path_edges(path):
+    return [tuple(sorted(pair)) for pair in zip(path[:-1], path[1:])]
+
+
+def assert_edges_covered_once(edges, paths):
+    walked = sorted(edge for path in paths for edge in path_edges(path))
+    assert walked == sorted(tuple(sorted(edge)) for edge in edges)
+
+
+def test_t_junction_keeps_every_edge():
+    edges = [(0, 1), (1, 2), (1, 3)]
+    closed, open_paths = walk(edges)
+    assert closed == []
+    assert len(open_paths) == 2
+    assert_edges_covered_once(edges, open_paths)
+
+
+def test_chain_with_lowest_id_in_the_middle_is_one_path():
+    edges = [(3, 0), (0, 2), (2, 1)]
+    closed, open_paths = walk(edges)
+    assert closed == []
+    assert len(open_paths) == 1
+    assert sorted([open_paths[0][0], open_paths[0][-1]]) == [1, 3]
+    assert_edges_covered_once(edges, open_paths)
+
+
+def test_two_loops_sharing_a_vertex():
+    edges = [(0, 1), (1, 2), (0, 2), (0, 3), (3, 4), (0, 4)]
+    closed, open_paths = walk(edges)
+    assert open_paths == []
+    assert len(closed) == 2
+    assert all(path[0] == path[-1] for path in closed)
+    assert_edges_covered_once(edges, closed)
+
+
+def test_empty_graph():
+    assert walk([]) == ([], [])
+
+
+def test_random_graphs_cover_each_edge_exactly_once():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        n = int(rng.integers(2, 12))
+        edges = rng.integers(0, n, (int(rng.integers(1, 20)), 2))
+        edges.sort(axis=1)
+        edges = np.unique(edges[edges[:, 0] != edges[:, 1]], axis=0)
+        if not len(edges):
+            continue
+        closed, open_paths = walk(edges)
+        assert all(path[0] == path[-1] and len(path) > 3 for path in closed)
+        assert_edges_covered_once(edges.tolist(), closed + open_paths)
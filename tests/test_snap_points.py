@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fix_dxf import snap_points_kdtree
+
+
+def test_merges_points_straddling_a_cell_boundary():
+    # With tolerance 1.0 the grid spacing is 0.5: (0.24, 0) and (1.2, 0) sit
+    # in different cells whose first points are farther apart than 1.0.
+    points = np.array([[-0.24, 0.0], [0.24, 0.0], [1.2, 0.0], [1.24, 0.0]])
+    _, ids = snap_points_kdtree(points, 1.0)
+    assert len(set(ids.tolist())) == 1
+
+
+def test_keeps_distant_points_apart():
+    points = np.array([[0.0, 0.0], [0.1, 0.0], [5.0, 0.0]])
+    table, ids = snap_points_kdtree(points, 1.0)
+    assert ids[0] == ids[1] != ids[2]
+    assert np.array_equal(table[ids[2]], points[2])
+
+
+def test_every_pair_within_tolerance_is_merged():
+    rng = np.random.default_rng(0)
+    tolerance = 1e-4
+    base = rng.uniform(0, 10, (20000, 2))
+    points = np.repeat(base, 3, axis=0) + rng.normal(0, 0.3 * tolerance, (60000, 2))
+    _, ids = snap_points_kdtree(points, tolerance)
+    pairs = cKDTree(points).query_pairs(tolerance, output_type="ndarray")
+    assert len(pairs)
+    assert np.array_equal(ids[pairs[:, 0]], ids[pairs[:, 1]])
+
+
+def test_zero_tolerance_merges_exact_duplicates_only():
+    points = np.array([[0.0, 0.0], [1e-12, 0.0], [0.0, 0.0], [1.0, 1.0]])
+    table, ids = snap_points_kdtree(points, 0.0)
+    assert ids[0] == ids[2]
+    assert len(set(ids.tolist())) == 3
+    assert np.array_equal(table[ids], points)
+
+
+def test_coordinates_beyond_int64_grid_stay_apart():
+    # At tolerance 1e-4 the cell coordinate of 1e15 is 2e19, past int64.
+    points = np.array([[1e15, 0.0], [-1e15, 0.0], [0.0, 0.0], [0.0, 5e-5]])
+    _, ids = snap_points_kdtree(points, 1e-4)
+    assert len({ids[0], ids[1], ids[2]}) == 3
+    assert ids[2] == ids[3]